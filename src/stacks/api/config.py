@@ -1,5 +1,6 @@
 import logging
 import time
+import requests
 from flask import (
     jsonify,
     request,
@@ -8,12 +9,24 @@ from flask import (
 from stacks.constants import FAST_DOWNLOAD_API_URL, KNOWN_MD5
 from . import api_bp
 from stacks.utils.logutils import setup_logging
+from stacks.utils.jsonutils import loads
+from stacks.utils.httputils import HTTP_SESSION
 from stacks.security.auth import (
     require_auth,
 )
 
 logger = logging.getLogger("api")
 
+# Upper bound on the key test response we are willing to read
+_MAX_KEY_TEST_BYTES = 65536
+
+# Recent key test results, so repeated clicks on "Test Key" don't hit the API again
+_KEY_TEST_TTL = 30
+_key_test_cache = {}  # key -> (monotonic timestamp, payload, status code)
+
+# Sections whose changes require recreating the downloader
+_DOWNLOADER_SECTIONS = frozenset({'downloads', 'fast_download', 'flaresolverr'})
+
 @api_bp.route('/api/config/test_flaresolverr', methods=['POST'])
 @require_auth
 def api_config_test_flaresolverr():
@@ -33,10 +46,8 @@ def api_config_test_flaresolverr():
         test_url = f"http://{test_url}"
 
     try:
-        import requests
-
         # Try to connect to FlareSolverr's health endpoint
-        response = requests.get(test_url, timeout=timeout)
+        response = HTTP_SESSION.get(test_url, timeout=timeout)
         
         if response.status_code == 200:
             return jsonify({
@@ -65,7 +76,17 @@ def api_config_test_flaresolverr():
             'success': False,
             'error': f'Connection failed: {str(e)}'
         }), 500
-    
+
+def _cached_key_result(test_key, payload, status=200):
+    """Remember a definitive key test result and build its response"""
+    now = time.monotonic()
+    for key, (ts, _, _) in list(_key_test_cache.items()):
+        if now - ts >= _KEY_TEST_TTL:
+            _key_test_cache.pop(key, None)  # Another request may have pruned it already
+    _key_test_cache[test_key] = (now, payload, status)
+    return jsonify(payload), status
+
+
 @api_bp.route('/api/config/test_key', methods=['POST'])
 @require_auth
 def api_config_test_key():
@@ -78,23 +99,26 @@ def api_config_test_key():
             'success': False,
             'error': 'No key provided'
         }), 400
-    
+
+    cached = _key_test_cache.get(test_key)
+    if cached and time.monotonic() - cached[0] < _KEY_TEST_TTL:
+        return jsonify(cached[1]), cached[2]
+
     try:
-        import requests
-        
         # Use a known valid MD5 for testing
-                
-        response = requests.get(
+        with HTTP_SESSION.get(
             FAST_DOWNLOAD_API_URL,
             params={
                 'md5': KNOWN_MD5,
                 'key': test_key
             },
-            timeout=10
-        )
-        
+            timeout=10,
+            stream=True
+        ) as response:
+            body = response.raw.read(_MAX_KEY_TEST_BYTES, decode_content=True)
+
         if response.status_code == 200:
-            data = response.json()
+            data = loads(body)
             if data.get('download_url'):
                 info = data.get('account_fast_download_info', {})
                 
@@ -105,11 +129,11 @@ def api_config_test_key():
                         'available': True,
                         'downloads_left': info.get('downloads_left'),
                         'downloads_per_day': info.get('downloads_per_day'),
-                        'recently_downloaded_md5s': info.get('recently_downloaded_md5s', []),
+                        'recently_downloaded_md5s': frozenset(info.get('recently_downloaded_md5s', ())),
                         'last_refresh': time.time()
                     })
                 
-                return jsonify({
+                return _cached_key_result(test_key, {
                     'success': True,
                     'message': 'Key is valid',
                     'downloads_left': info.get('downloads_left'),
@@ -121,15 +145,15 @@ def api_config_test_key():
                     'error': 'No download URL in response'
                 }), 400
         elif response.status_code == 401:
-            return jsonify({
+            return _cached_key_result(test_key, {
                 'success': False,
                 'error': 'Invalid secret key'
-            }), 401
+            }, 401)
         elif response.status_code == 403:
-            return jsonify({
+            return _cached_key_result(test_key, {
                 'success': False,
                 'error': 'Not a member'
-            }), 403
+            }, 403)
         else:
             return jsonify({
                 'success': False,
@@ -151,49 +175,72 @@ def api_config_update():
     data = request.json
     logger = logging.getLogger('api')
     config = current_app.stacks_config
+    current_level = config.get('logging', 'level')
+    current_key = config.get('fast_download', 'key')
+    touched = set()
 
     try:
-        for section, values in data.items():
-            if isinstance(values, dict):
-                for key, new_value in values.items():
-                    config.set(section, key, value=new_value)
+        # Walk the schema table once and apply only the fields it declares
+        for section, fields in config.schema.items():
+            values = data.get(section)
+            if not isinstance(values, dict) or not isinstance(fields, dict):
+                continue
+            for key in fields.keys() & values.keys():
+                if config.get(section, key) != values[key]:
+                    touched.add(section)
+                config.set(section, key, value=values[key])
 
         config.data = config.validate(config.data, config.schema)
         config.ensure_login_credentials()
         config.save()
 
-        worker = current_app.stacks_worker
-        worker.update_config()
-        setup_logging(config)
+        # A cached test of the new key skipped updating the worker's info
+        if config.get('fast_download', 'key') != current_key:
+            _key_test_cache.clear()
+
+        # Recreating the downloader is expensive, skip it for unrelated settings
+        if touched & _DOWNLOADER_SECTIONS:
+            worker = current_app.stacks_worker
+            worker.update_config()
 
-        import copy
-        cfg = copy.deepcopy(config.get_all())
-        if "api" in cfg and "key" in cfg["api"]:
-            cfg["api"]["key"] = "***MASKED***"
-        if "login" in cfg and "password" in cfg["login"]:
-            cfg["login"]["password"] = "***MASKED***"
+        # Only rebuild the log handlers when the level actually changed
+        if config.get('logging', 'level') != current_level:
+            setup_logging(config)
 
         return jsonify({
             "success": True,
             "message": "Configuration updated",
-            "config": cfg
+            "config": _masked_view(config.get_all())
         })
 
     except Exception as e:
         logger.error(f"Failed to update config: {e}")
         return jsonify({"success": False, "error": str(e)}), 400
 
-    
+
+def _masked_view(cfg):
+    """Copy only the sections holding secrets and mask them, sharing everything else"""
+    out = dict(cfg)
+    if 'api' in out and 'key' in out['api']:
+        out['api'] = {**out['api'], 'key': '***MASKED***'}
+    if 'login' in out and 'password' in out['login']:
+        out['login'] = {**out['login'], 'password': '***MASKED***'}
+    return out
+
+
+def _masked_config_body(config):
+    """Return the masked config as JSON, reusing the cached body while the config is unchanged"""
+    # Cached on the Config itself, so another Config in the same process never shares it
+    version = config.version
+    cached = config.view_cache.get('masked_json')
+    if cached is None or cached[0] != version:
+        cached = config.view_cache['masked_json'] = (version, current_app.json.dumps(_masked_view(config.get_all())))
+    return cached[1]
+
+
 @api_bp.route('/api/config', methods=['GET'])
 @require_auth
 def api_config_get():
     """Get current configuration"""
-    import copy
     config = current_app.stacks_config
-    config_data = copy.deepcopy(config.get_all())
-    # Mask sensitive data
-    if 'api' in config_data and 'key' in config_data['api']:
-        config_data['api']['key'] = '***MASKED***'
-    if 'login' in config_data and 'password' in config_data['login']:
-        config_data['login']['password'] = '***MASKED***'
-    return jsonify(config_data)
\ No newline at end of file
+    return current_app.response_class(_masked_config_body(config), mimetype='application/json')
@@ -72,3 +72,40 @@ def api_queue_add():
         'message': message,
         'md5': extracted_md5
     })
+
+@api_bp.route('/api/queue/add_batch', methods=['POST'])
+@require_auth
+def api_queue_add_batch():
+    """Add several items to queue in one request"""
+    data = request.json
+    md5s = data.get('md5s')
+    
+    if not md5s or not isinstance(md5s, list):
+        return jsonify({'success': False, 'error': 'List of MD5s required'}), 400
+    
+    # Validate MD5s, keeping the request order and dropping duplicates
+    extracted = []
+    invalid = []
+    for value in md5s:
+        extracted_md5 = extract_md5(value) if isinstance(value, str) else None
+        if not extracted_md5:
+            invalid.append(value)
+        else:
+            extracted.append(extracted_md5)
+    
+    # Add to queue
+    q = current_app.stacks_queue
+    results = q.add_many(
+        list(dict.fromkeys(extracted)),
+        source=data.get('source')
+    )
+    
+    return jsonify({
+        'success': any(success for _, success, _ in results),
+        'added': sum(1 for _, success, _ in results if success),
+        'results': [
+            {'md5': md5, 'success': success, 'message': message}
+            for md5, success, message in results
+        ],
+        'invalid': invalid
+    })
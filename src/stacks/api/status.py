@@ -1,6 +1,7 @@
 import logging
 from flask import jsonify, current_app
 from stacks.utils.logutils import LOG_BUFFER
+from stacks.constants import VERSION, TAMPER_VERSION
 
 from . import api_bp
 from stacks.security.auth import require_auth
@@ -17,8 +18,6 @@ def health():
 @api_bp.get("/api/version")
 def api_version():
     """Get current version and tampermonkey script version"""
-    from stacks.constants import VERSION, TAMPER_VERSION
-
     return jsonify({
         "version": VERSION,
         "tamper_version": TAMPER_VERSION
@@ -1,8 +1,9 @@
+import atexit
 import threading
 import logging
 import yaml
 import copy
-from stacks.constants import CONFIG_FILE, CONFIG_SCHEMA_FILE
+from stacks.constants import CONFIG_FILE, CONFIG_SCHEMA_FILE, CONFIG_SAVE_DELAY
 from stacks.config.validate import _validate, ensure_login_credentials
 
 logger = logging.getLogger('config')
@@ -14,6 +15,12 @@ class Config:
         self.config_path = config_path
         self.schema_path = schema_path
         self.lock = threading.Lock()
+        self.version = 0  # Bumped on every change so readers can cache derived views
+        self.view_cache = {}  # Derived views kept by readers: name -> (version, value)
+        self._save_timer = None
+
+        # The save timer is a daemon thread, so write a pending change on any interpreter exit
+        atexit.register(self.flush)
 
         self.load_schema()
         self.load()
@@ -36,6 +43,7 @@ class Config:
             except FileNotFoundError:
                 logger.debug("No config found, seeding empty config for population.")
                 self.data = {}
+            self.version += 1
 
     def load_schema(self):
         """Load schema from file."""
@@ -45,6 +53,25 @@ class Config:
                 logger.debug("Loaded config schema.")
 
     def save(self):
+        """Schedule a save; saves requested in quick succession are written once."""
+        with self.lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(CONFIG_SAVE_DELAY, self._do_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            self.version += 1
+
+    def flush(self):
+        """Write a pending save to disk immediately."""
+        with self.lock:
+            timer = self._save_timer
+            self._save_timer = None
+        if timer is not None:
+            timer.cancel()
+            self._do_save()
+
+    def _do_save(self):
         """Save configuration to file."""
         with self.lock:
             with open(self.config_path, "w") as f:
@@ -83,6 +110,7 @@ class Config:
                 data = data[key]
             # Set value
             data[keys[-1]] = value
+            self.version += 1
     
     def get_all(self):
         """Get entire config as dict"""
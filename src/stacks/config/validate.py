@@ -92,7 +92,7 @@ def _validate_value(value, rules, key):
                         return value
             case "LOGGING":
                 if isinstance(value, str):
-                    if value.upper() in LOG_LEVELS:
+                    if value in LOG_LEVELS or value.upper() in LOG_LEVELS:
                         return value
             case "BCRYPTHASH":
                 if is_valid_bcrypt_hash(value) and not os.environ.get('RESET_ADMIN','').lower() == 'true':
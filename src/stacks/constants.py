@@ -21,6 +21,7 @@ QUEUE_FILE = CONFIG_PATH / "queue.json"
 CONFIG_FILE = CONFIG_PATH / "config.yaml"
 CONFIG_SCHEMA_FILE = FILES_PATH / "config_schema.yaml"
 COOKIE_CACHE_DIR = CACHE_PATH  # Directory for domain-specific cookie files
+FAST_DOWNLOAD_CACHE_FILE = CACHE_PATH / "fast_download_info.json"
 
 # URLs
 FAST_DOWNLOAD_API_URL = "https://annas-archive.org/dyn/api/fast_download.json"
@@ -28,8 +29,13 @@ FAST_DOWNLOAD_API_URL = "https://annas-archive.org/dyn/api/fast_download.json"
 # Logging
 LOG_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
-LOG_LEVELS = ["INFO", "ERROR", "WARN", "DEBUG"]
+LOG_LEVELS = frozenset({"INFO", "ERROR", "WARN", "DEBUG"})
 LOG_VIEW_LENGTH = 1000
+LOG_FILENAME = "stacks.log"  # Rotated at midnight, older days get a date suffix
+LOG_BACKUP_DAYS = 14
+
+# Config writes are coalesced into one save this long after the last change
+CONFIG_SAVE_DELAY = 0.2
 
 # Default credentials
 DEFAULT_USERNAME = "admin"
@@ -45,6 +51,10 @@ RE_IPV4 = re.compile(r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0
 RE_IPV6 = re.compile(r"^((\[((?:[0-9A-Fa-f]{1,4}:){7}[0-9A-Fa-f]{1,4}|([0-9A-Fa-f]{1,4}:){1,7}:|:([0-9A-Fa-f]{1,4}:){1,7}|([0-9A-Fa-f]{1,4}:){1,6}[0-9A-Fa-f]{1,4}|([0-9A-Fa-f]{1,4}:){1,5}(:[0-9A-Fa-f]{1,4}){1,2}|([0-9A-Fa-f]{1,4}:){1,4}(:[0-9A-Fa-f]{1,4}){1,3}|([0-9A-Fa-f]{1,4}:){1,3}(:[0-9A-Fa-f]{1,4}){1,4}|([0-9A-Fa-f]{1,4}:){1,2}(:[0-9A-Fa-f]{1,4}){1,5}|[0-9A-Fa-f]{1,4}:((:[0-9A-Fa-f]{1,4}){1,6})|:((:[0-9A-Fa-f]{1,4}){1,7}))\])(?::(?:6553[0-5]|655[0-2]\d|65[0-4]\d{2}|6[0-4]\d{3}|[1-5]\d{4}|[1-9]\d{0,3}))?$|(?:[0-9A-Fa-f]{1,4}:){7}[0-9A-Fa-f]{1,4}|([0-9A-Fa-f]{1,4}:){1,7}:|:([0-9A-Fa-f]{1,4}:){1,7}|([0-9A-Fa-f]{1,4}:){1,6}[0-9A-Fa-f]{1,4}|([0-9A-Fa-f]{1,4}:){1,5}(:[0-9A-Fa-f]{1,4}){1,2}|([0-9A-Fa-f]{1,4}:){1,4}(:[0-9A-Fa-f]{1,4}){1,3}|([0-9A-Fa-f]{1,4}:){1,3}(:[0-9A-Fa-f]{1,4}){1,4}|([0-9A-Fa-f]{1,4}:){1,2}(:[0-9A-Fa-f]{1,4}){1,5}|[0-9A-Fa-f]{1,4}:((:[0-9A-Fa-f]{1,4}){1,6})|:((:[0-9A-Fa-f]{1,4}){1,7}))$")
 RE_URL = re.compile(r"^(?:https?:\/\/)?(?=[a-zA-Z0-9])[a-zA-Z0-9](?:[a-zA-Z0-9-]*[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]*[a-zA-Z0-9])?)*(?::(?:6553[0-5]|655[0-2]\d|65[0-4]\d{2}|6[0-4]\d{3}|[1-5]\d{4}|[1-9]\d{0,3}))?$")
 RE_32_BIT_KEY = re.compile(r"^[A-Za-z0-9_-]{32}$")
+RE_MD5 = re.compile(r"^[a-f0-9]{32}$")
+RE_MD5_URL = re.compile(r"/md5/([a-f0-9]{32})")
+RE_CLIPBOARD_URL = re.compile(r"writeText\('([^']+)'")
+RE_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
 
 # Known MD5 for testing
 KNOWN_MD5 = "d6e1dc51a50726f00ec438af21952a45"
@@ -3,7 +3,7 @@ import json
 import re
 from urllib.parse import urlparse
 from pathlib import Path
-from stacks.constants import COOKIE_CACHE_DIR
+from stacks.constants import COOKIE_CACHE_DIR, KNOWN_MD5
 
 def _get_cookie_filename(domain_or_url):
     """Convert domain/URL to a safe cookie filename.
@@ -114,7 +114,6 @@ def _prewarm_cookies(d):
 
     # Use a slow_download URL to trigger DDG challenge and get all cookies
     # This ensures we get __ddg* cookies needed for slow_download access
-    from stacks.constants import KNOWN_MD5
     test_url = f"https://annas-archive.org/slow_download/{KNOWN_MD5}/0/0"
 
     success, cookies, _ = d.solve_with_flaresolverr(test_url)
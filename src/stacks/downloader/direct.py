@@ -1,20 +1,150 @@
-import re
+import os
+import math
 import time
 import requests
 import shutil
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urlparse, unquote
+from stacks.constants import LEGAL_FILES, RE_UNSAFE_FILENAME_CHARS
+
+# Page titles that end up as filenames when we scraped a web page instead of a book
+_FORBIDDEN_KEYWORDS = ("anna's archive", "anna’s archive", "annas archive")
+
+# Book formats we allow to be saved
+_ALLOWED_EXTENSIONS = frozenset({'.epub', '.mobi', '.azw3'})
+
+# Parallel range downloads: files of at least this size are split into parts of about this size
+_PARALLEL_PART_SIZE = 8 * 1024 * 1024
+_PARALLEL_MIN_SIZE = 2 * _PARALLEL_PART_SIZE
+_PARALLEL_MAX_PARTS = 6
+
+# Network read size, and the headers used for file requests.
+# Books are already compressed, so ask for identity encoding to skip a gzip pass.
+_CHUNK_SIZE = 256 * 1024
+_DOWNLOAD_HEADERS = {'Accept-Encoding': 'identity'}
+
+# Received chunks are buffered up to this size before being written out,
+# with a single pwritev call for range parts and by the file buffer otherwise
+_WRITE_BATCH_SIZE = 1024 * 1024
+
+# Progress updates are sent at most this often (seconds), plus once when the data is complete
+_PROGRESS_INTERVAL = 0.1
+
+# Page cache hints are only available on POSIX
+_HAS_FADVISE = hasattr(os, 'posix_fadvise')
 
 
 def calculate_md5(filepath):
     """Calculate MD5 hash of a file."""
     hash_md5 = hashlib.md5()
     with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        if _HAS_FADVISE:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             hash_md5.update(chunk)
+        if _HAS_FADVISE:
+            # The book is not read again by us, don't let it push other data out of the cache
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
     return hash_md5.hexdigest()
 
+def _pwrite_all(fd, buffers, offset):
+    """Write a batch of buffers at offset, one syscall in the common case."""
+    total = sum(len(buf) for buf in buffers)
+    written = os.pwritev(fd, buffers, offset)
+    if written < total:
+        # Short write, finish the rest the slow way
+        data = memoryview(b''.join(buffers))
+        while written < total:
+            written += os.pwrite(fd, data[written:], offset + written)
+    return total
+
+def _probe_size(d, download_url):
+    """Get the file size with a HEAD request, or None if the server doesn't tell."""
+    try:
+        response = d.session.head(download_url, headers=_DOWNLOAD_HEADERS, allow_redirects=True, timeout=30)
+        size = int(response.headers.get('Content-Length') or 0)
+        # Redirectors and CDNs often answer HEAD with a length of 0, treat that as unknown
+        if response.status_code == 200 and size > 0:
+            return size
+    except Exception as e:
+        d.logger.debug(f"Could not probe file size: {e}")
+    return None
+
+def _download_ranges(d, download_url, temp_path, total_size):
+    """Fetch a file as parallel byte ranges, each written in place with os.pwrite.
+
+    Returns True when every range was written completely.
+    """
+    parts = min(_PARALLEL_MAX_PARTS, math.ceil(total_size / _PARALLEL_PART_SIZE))
+    step = math.ceil(total_size / parts)
+    ranges = [(start, min(start + step, total_size) - 1) for start in range(0, total_size, step)]
+
+    lock = threading.Lock()
+    failed = threading.Event()
+    progress = {'downloaded': 0, 'reported_at': 0.0}
+
+    def report(size):
+        with lock:
+            progress['downloaded'] += size
+            now = time.monotonic()
+            done = progress['downloaded'] >= total_size
+            if d.progress_callback and (done or now - progress['reported_at'] >= _PROGRESS_INTERVAL):
+                progress['reported_at'] = now
+                d.progress_callback({
+                    'total_size': total_size,
+                    'downloaded': progress['downloaded'],
+                    'percent': round(progress['downloaded'] / total_size * 100, 1)
+                })
+
+    def fetch(start, end):
+        headers = {**_DOWNLOAD_HEADERS, 'Range': f'bytes={start}-{end}'}
+        with d.session.get(download_url, headers=headers, stream=True, timeout=30) as response:
+            if response.status_code != 206:
+                raise Exception(f"Range request returned status {response.status_code}")
+            offset = start
+            batch, batch_size = [], 0
+            for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                if failed.is_set():
+                    return
+                if chunk:
+                    batch.append(chunk)
+                    batch_size += len(chunk)
+                    if batch_size >= _WRITE_BATCH_SIZE:
+                        offset += _pwrite_all(fd, batch, offset)
+                        report(batch_size)
+                        batch, batch_size = [], 0
+            if batch:
+                offset += _pwrite_all(fd, batch, offset)
+                report(batch_size)
+        if offset != end + 1:
+            raise Exception(f"Incomplete range {start}-{end}: got {offset - start} bytes")
+
+    d.logger.info(f"Downloading in {len(ranges)} parallel parts")
+    fd = os.open(temp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        # Reserve the blocks up front so out-of-order writes don't fragment the file
+        try:
+            os.posix_fallocate(fd, 0, total_size)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, total_size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(fetch, start, end) for start, end in ranges]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception:
+                    failed.set()  # Stop the other parts early
+                    raise
+        return True
+    except Exception as e:
+        d.logger.warning(f"Parallel download failed: {e}")
+        return False
+    finally:
+        os.close(fd)
+
 def download_direct(d, download_url, title=None, total_size=None, supports_resume=True, resume_attempts=3, md5=None):
     """Download a file directly from a URL with resume support.
 
@@ -37,14 +167,12 @@ def download_direct(d, download_url, title=None, total_size=None, supports_resum
                 filename = 'download.epub'  # Default fallback
         else:
             # Clean filename (remove invalid characters)
-            filename = re.sub(r'[<>:"/\\|?*]', '_', title)
+            filename = RE_UNSAFE_FILENAME_CHARS.sub('_', title)
 
         # ------------------ [新增代码开始] ------------------
         # 关键词黑名单检查
         # 如果文件名包含 "Anna's Archive"，说明抓取到了网页标题，而不是书名
-        forbidden_keywords = ["anna's archive", "anna’s archive", "annas archive"]
-
-        if any(keyword in filename.lower() for keyword in forbidden_keywords):
+        if any(keyword in filename.lower() for keyword in _FORBIDDEN_KEYWORDS):
             d.logger.error(f"Aborting download: Invalid filename '{filename}' detected (likely downloaded a webpage instead of a book).")
             return None
         # ------------------ [新增代码结束] ------------------
@@ -52,10 +180,9 @@ def download_direct(d, download_url, title=None, total_size=None, supports_resum
         # ---------------- [修改开始] ----------------
         # 强制后缀检查
         file_ext = Path(filename).suffix.lower()
-        allowed = {'.epub', '.mobi', '.azw3'}
 
         # 如果检测到后缀是 PDF/TXT 等，直接返回 None
-        if file_ext and file_ext not in allowed:
+        if file_ext and file_ext not in _ALLOWED_EXTENSIONS:
             d.logger.error(f"Download blocked: Filename '{filename}' is not epub/mobi/azw3.")
             return None
 
@@ -66,7 +193,6 @@ def download_direct(d, download_url, title=None, total_size=None, supports_resum
         # ---------------- [修改结束] ----------------
 
         # Validate extension - warn if suspicious but don't modify
-        from stacks.constants import LEGAL_FILES
         file_ext = Path(filename).suffix.lower()
 
         if not file_ext:
@@ -89,18 +215,27 @@ def download_direct(d, download_url, title=None, total_size=None, supports_resum
         # Download with resume
         for attempt in range(resume_attempts):
             try:
-                headers = {}
+                headers = dict(_DOWNLOAD_HEADERS)
                 if downloaded > 0 and supports_resume:
-                    headers['Range'] = f'bytes={downloaded}-'
+                    # Ask for a bounded range when the size is known
+                    if total_size is None:
+                        total_size = _probe_size(d, download_url)
+                    end = total_size - 1 if total_size else ''
+                    headers['Range'] = f'bytes={downloaded}-{end}'
                     d.logger.info(f"Resuming from byte {downloaded}")
 
                 response = d.session.get(download_url, headers=headers, stream=True, timeout=30)
 
-                if downloaded > 0 and response.status_code not in [200, 206]:
+                if downloaded > 0 and response.status_code == 200:
+                    # Server ignored the range and is sending the whole file
+                    d.logger.warning("Resume ignored by server, starting fresh")
+                    downloaded = 0
+                    temp_path.unlink(missing_ok=True)
+                elif downloaded > 0 and response.status_code != 206:
                     d.logger.warning(f"Resume not supported (status {response.status_code}), starting fresh")
                     downloaded = 0
                     temp_path.unlink(missing_ok=True)
-                    response = d.session.get(download_url, stream=True, timeout=30)
+                    response = d.session.get(download_url, headers=_DOWNLOAD_HEADERS, stream=True, timeout=30)
 
                 # Get total size
                 if total_size is None:
@@ -111,21 +246,55 @@ def download_direct(d, download_url, title=None, total_size=None, supports_resum
                         else:
                             total_size = int(content_length)
 
+                # Large fresh downloads from servers that accept ranges are split across connections
+                parallel = (
+                    downloaded == 0
+                    and response.status_code == 200
+                    and total_size is not None
+                    and total_size >= _PARALLEL_MIN_SIZE
+                    and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                    and response.headers.get('Content-Encoding', 'identity').lower() == 'identity'
+                )
+                if parallel:
+                    response.close()
+                    if _download_ranges(d, download_url, temp_path, total_size):
+                        downloaded = total_size
+                    else:
+                        d.logger.warning("Falling back to a single connection")
+                        temp_path.unlink(missing_ok=True)
+                        response = d.session.get(download_url, headers=_DOWNLOAD_HEADERS, stream=True, timeout=30)
+                        parallel = False
+
                 # Download
-                mode = 'ab' if downloaded > 0 else 'wb'
-                with open(temp_path, mode) as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-
-                            if d.progress_callback and total_size:
-                                percent = (downloaded / total_size) * 100
-                                d.progress_callback({
-                                    'total_size': total_size,
-                                    'downloaded': downloaded,
-                                    'percent': round(percent, 1)
-                                })
+                if not parallel:
+                    mode = 'ab' if downloaded > 0 else 'wb'
+                    report = d.progress_callback if total_size else None
+                    reported_at = 0.0
+                    pending = False
+                    with open(temp_path, mode, buffering=_WRITE_BATCH_SIZE) as f:
+                        for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                            if chunk:
+                                f.write(chunk)
+                                downloaded += len(chunk)
+
+                                if report:
+                                    now = time.monotonic()
+                                    pending = now - reported_at < _PROGRESS_INTERVAL and downloaded < total_size
+                                    if not pending:
+                                        reported_at = now
+                                        report({
+                                            'total_size': total_size,
+                                            'downloaded': downloaded,
+                                            'percent': round(downloaded / total_size * 100, 1)
+                                        })
+
+                    # Always deliver the last update if it was throttled
+                    if pending:
+                        report({
+                            'total_size': total_size,
+                            'downloaded': downloaded,
+                            'percent': round(downloaded / total_size * 100, 1)
+                        })
 
                 # Verify complete
                 if total_size and downloaded < total_size:
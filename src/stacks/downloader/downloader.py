@@ -1,20 +1,21 @@
 import logging
-import requests
 from pathlib import Path
+from urllib3.util.retry import Retry
 from stacks.utils.md5utils import extract_md5
 from stacks.downloader.cookies import _load_cached_cookies, _save_cookies_to_cache, _prewarm_cookies
 from stacks.downloader.direct import download_direct
-from stacks.downloader.fast_download import try_fast_download, get_fast_download_info, refresh_fast_download_info
+from stacks.downloader.fast_download import try_fast_download, get_fast_download_info, is_fast_download_info_stale, refresh_fast_download_info
 from stacks.downloader.flaresolver import solve_with_flaresolverr
 from stacks.downloader.html import get_download_links, parse_download_link_from_html
-from stacks.downloader.mirrors import download_from_mirror
+from stacks.downloader.mirrors import download_from_mirror, resolve_mirror_link
 from stacks.downloader.orchestrator import orchestrate_download
 from stacks.downloader.utils import get_unique_filename
+from stacks.utils.httputils import create_session
 
 class AnnaDownloader:
     def __init__(self, output_dir="./downloads", incomplete_dir=None, progress_callback=None,
                  fast_download_config=None, flaresolverr_url=None, flaresolverr_timeout=60000,
-                 status_callback=None):
+                 status_callback=None, session=None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -24,7 +25,16 @@ class AnnaDownloader:
             self.incomplete_dir = self.output_dir / "incomplete"
         self.incomplete_dir.mkdir(parents=True, exist_ok=True)
 
-        self.session = requests.Session()
+        # Pooled keep-alive session; transient gateway errors and dropped connections are retried.
+        # 503 is left alone as mirrors use it for DDoS-Guard challenges that FlareSolverr handles.
+        # An existing session can be handed over to keep its warm connections.
+        if session is None:
+            session = create_session(
+                pool_connections=8,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 504], raise_on_status=False)
+            )
+        self.session = session
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
         })
@@ -46,7 +56,7 @@ class AnnaDownloader:
             'available': bool(self.fast_download_enabled and self.fast_download_key),
             'downloads_left': None,
             'downloads_per_day': None,
-            'recently_downloaded_md5s': [],
+            'recently_downloaded_md5s': frozenset(),
             'last_refresh': 0
         }
 
@@ -96,6 +106,9 @@ class AnnaDownloader:
     def get_fast_download_info(self):
         return get_fast_download_info(self)
 
+    def is_fast_download_info_stale(self):
+        return is_fast_download_info_stale(self)
+
     def refresh_fast_download_info(self, force=False):
         return refresh_fast_download_info(self, force)
 
@@ -114,8 +127,11 @@ class AnnaDownloader:
 
 
     # Mirrors
-    def download_from_mirror(self, mirror_url, mirror_type, md5, title=None, resume_attempts=3):
-        return download_from_mirror(self, mirror_url, mirror_type, md5, title, resume_attempts)
+    def download_from_mirror(self, mirror_url, mirror_type, md5, title=None, resume_attempts=3, status=None, cancel=None):
+        return download_from_mirror(self, mirror_url, mirror_type, md5, title, resume_attempts, status, cancel)
+
+    def resolve_mirror_link(self, mirror_url, mirror_type, md5, status=None, cancel=None):
+        return resolve_mirror_link(self, mirror_url, mirror_type, md5, status, cancel)
 
 
     # Utils
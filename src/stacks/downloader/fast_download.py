@@ -1,12 +1,66 @@
+import os
 import time
-from stacks.constants import KNOWN_MD5
+import hashlib
+import tempfile
+from stacks.constants import KNOWN_MD5, FAST_DOWNLOAD_CACHE_FILE
+from stacks.utils.jsonutils import loads, dumps
+
+# How long the on-disk info stays usable after a restart
+_CACHE_TTL = 60
+
+def _key_hash(key):
+    """Identify the key in the cache file without storing it."""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def _load_cached_info(d):
+    """Load fast download info saved by a previous run, if it is fresh and for the same key."""
+    try:
+        with open(FAST_DOWNLOAD_CACHE_FILE, 'rb') as f:
+            data = loads(f.read())
+        if data.get('key_hash') != _key_hash(d.fast_download_key):
+            return False
+        info = data.get('info', {})
+        if time.time() - info.get('last_refresh', 0) >= _CACHE_TTL:
+            return False
+        info['recently_downloaded_md5s'] = frozenset(info.get('recently_downloaded_md5s', ()))
+        d.fast_download_info.update(info)
+        d.logger.debug("Loaded cached fast download info")
+        return True
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        d.logger.debug(f"Failed to load cached fast download info: {e}")
+        return False
+
+def _save_info_to_cache(d):
+    """Save fast download info so a restart within the TTL can skip the API call."""
+    temp_file = None
+    try:
+        FAST_DOWNLOAD_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name, the worker and the background refresh may save at the same time
+        with tempfile.NamedTemporaryFile('w', dir=FAST_DOWNLOAD_CACHE_FILE.parent,
+                                         prefix=FAST_DOWNLOAD_CACHE_FILE.name, suffix='.tmp', delete=False) as f:
+            temp_file = f.name
+            f.write(dumps({
+                'key_hash': _key_hash(d.fast_download_key),
+                'info': get_fast_download_info(d)
+            }))
+        os.replace(temp_file, FAST_DOWNLOAD_CACHE_FILE)
+    except Exception as e:
+        d.logger.debug(f"Failed to cache fast download info: {e}")
+        if temp_file:
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
 
 def try_fast_download(d, md5):
     """Attempt fast download via membership API."""
     if not d.fast_download_enabled or not d.fast_download_key:
         return False, "Fast download not configured"
     
-    if d.fast_download_info.get('downloads_left') is not None:
+    # Files downloaded recently can be fetched again without using up a download
+    if d.fast_download_info.get('downloads_left') is not None and md5 not in d.fast_download_info['recently_downloaded_md5s']:
         if d.fast_download_info['downloads_left'] <= 0:
             return False, "No fast downloads remaining"
     
@@ -21,7 +75,7 @@ def try_fast_download(d, md5):
         }
         
         response = d.session.get(d.fast_download_api_url, params=params, timeout=10)
-        data = response.json()
+        data = loads(response.content)
         
         if 'download_url' in data and data['download_url']:
             if 'account_fast_download_info' in data:
@@ -30,9 +84,10 @@ def try_fast_download(d, md5):
                     'available': True,
                     'downloads_left': info.get('downloads_left'),
                     'downloads_per_day': info.get('downloads_per_day'),
-                    'recently_downloaded_md5s': info.get('recently_downloaded_md5s', []),
+                    'recently_downloaded_md5s': frozenset(info.get('recently_downloaded_md5s', ())),
                     'last_refresh': time.time()
                 })
+                _save_info_to_cache(d)
                 d.logger.info(f"Fast downloads: {info.get('downloads_left')}/{info.get('downloads_per_day')} remaining")
             
             return True, data['download_url']
@@ -46,17 +101,30 @@ def try_fast_download(d, md5):
     
 def get_fast_download_info(d):
     """Get current fast download status."""
-    return d.fast_download_info.copy()
+    info = d.fast_download_info.copy()
+    info['recently_downloaded_md5s'] = sorted(info['recently_downloaded_md5s'])
+    return info
+
+def is_fast_download_info_stale(d):
+    """Whether fast download is configured and its info is past the refresh cooldown."""
+    if not d.fast_download_enabled or not d.fast_download_key:
+        return False
+    return time.time() - d.fast_download_info.get('last_refresh', 0) >= d.fast_download_refresh_cooldown
 
 def refresh_fast_download_info(d, force=False):
-    """Refresh fast download info from API (respects 1-hour cooldown)."""
+    """Refresh fast download info from API (respects 1-hour cooldown).
+
+    force skips the in-memory cooldown, but info saved to disk within the
+    last minute (e.g. just before a restart) is still used instead of the API.
+    """
     if not d.fast_download_enabled or not d.fast_download_key:
         return False
     
-    if not force:
-        time_since_refresh = time.time() - d.fast_download_info.get('last_refresh', 0)
-        if time_since_refresh < d.fast_download_refresh_cooldown:
-            return True
+    if not force and not is_fast_download_info_stale(d):
+        return True
+
+    if _load_cached_info(d):
+        return True
     
     try:
         params = {
@@ -67,7 +135,7 @@ def refresh_fast_download_info(d, force=False):
         }
         
         response = d.session.get(d.fast_download_api_url, params=params, timeout=10)
-        data = response.json()
+        data = loads(response.content)
         
         if 'account_fast_download_info' in data:
             info = data['account_fast_download_info']
@@ -75,9 +143,10 @@ def refresh_fast_download_info(d, force=False):
                 'available': True,
                 'downloads_left': info.get('downloads_left'),
                 'downloads_per_day': info.get('downloads_per_day'),
-                'recently_downloaded_md5s': info.get('recently_downloaded_md5s', []),
+                'recently_downloaded_md5s': frozenset(info.get('recently_downloaded_md5s', ())),
                 'last_refresh': time.time()
             })
+            _save_info_to_cache(d)
             return True
         
         return False
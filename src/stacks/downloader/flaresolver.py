@@ -14,7 +14,7 @@ def solve_with_flaresolverr(d, url):
             "maxTimeout": d.flaresolverr_timeout
         }
         
-        response = requests.post(
+        response = d.session.post(
             f"{d.flaresolverr_url}/v1",
             json=payload,
             timeout=d.flaresolverr_timeout / 1000 + 10
@@ -1,8 +1,7 @@
-import re
 from urllib.parse import urlparse, urljoin
 from bs4 import BeautifulSoup
 from stacks.downloader.sites.zlib import parse_zlib_download_link, is_zlib_domain
-from stacks.constants import LEGAL_FILES
+from stacks.constants import LEGAL_FILES, RE_CLIPBOARD_URL
 
 
 def parse_download_link_from_html(d, html_content, md5, mirror_url=None):
@@ -106,7 +105,7 @@ def parse_download_link_from_html(d, html_content, md5, mirror_url=None):
         # Method 3: clipboard buttons containing real URLs
         for btn in soup.find_all('button', onclick=True):
             onclick = btn['onclick']
-            match = re.search(r"writeText\('([^']+)'", onclick)
+            match = RE_CLIPBOARD_URL.search(onclick)
             if match:
                 url = match.group(1)
 
@@ -1,20 +1,57 @@
-def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_attempts=3):
+def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_attempts=3, status=None, cancel=None):
+    """Resolve the download link on a mirror page and download the file."""
+    download_link = d.resolve_mirror_link(mirror_url, mirror_type, md5, status=status, cancel=cancel)
+    if not download_link or (cancel is not None and cancel.is_set()):
+        return None
+
+    status = status or d.status_callback
+    if status:
+        status("Downloading file...")
+
+    return d.download_direct(download_link, title=title, resume_attempts=resume_attempts, md5=md5)
+
+
+def resolve_mirror_link(d, mirror_url, mirror_type, md5, status=None, cancel=None):
     """
-    Download from any mirror with stale cookie handling.
+    Resolve the file download link from any mirror with stale cookie handling.
 
     Logic:
     - slow_download: Use pre-warmed cookies with direct HTTP requests
     - external_mirror: Try direct, use FlareSolverr on 403 (with cookie refresh)
+
+    Args:
+        status: Status callback (defaults to d.status_callback)
+        cancel: threading.Event; once set, no further status update or network request is made
+
+    Returns:
+        Download URL or None
     """
+    status = status or d.status_callback
+
+    def notify(message):
+        """Send a status update unless cancelled."""
+        if status and not (cancel is not None and cancel.is_set()):
+            status(message)
+
+    def proceed(message=None):
+        """Gate a network step: return False if cancelled, otherwise send the status update (if any)."""
+        if cancel is not None and cancel.is_set():
+            return False
+        if message:
+            notify(message)
+        return True
+
     try:
         if mirror_type == 'slow_download':
             d.logger.debug("Accessing slow download (via cookies)")
 
             # Try to load cached cookies for this domain
+            if not proceed():
+                return None
             d.load_cached_cookies(domain='annas-archive.org')
 
-            if hasattr(d, 'status_callback'):
-                d.status_callback("Accessing slow download page...")
+            if not proceed("Accessing slow download page..."):
+                return None
 
             try:
                 # Try to fetch the slow_download page with cookies
@@ -28,8 +65,8 @@ def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_att
 
                     d.logger.warning(f"Got {response.status_code}, solving challenge with FlareSolverr...")
 
-                    if hasattr(d, 'status_callback'):
-                        d.status_callback("Solving CAPTCHA with FlareSolverr...")
+                    if not proceed("Solving CAPTCHA with FlareSolverr..."):
+                        return None
 
                     # Solve challenge for THIS specific URL
                     success, cookies, html_content = d.solve_with_flaresolverr(mirror_url)
@@ -38,35 +75,27 @@ def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_att
                         d.logger.error("FlareSolverr failed")
                         return None
 
-                    if hasattr(d, 'status_callback'):
-                        d.status_callback("Extracting download link...")
+                    notify("Extracting download link...")
 
                     download_link = d.parse_download_link_from_html(html_content, md5, mirror_url)
                     if not download_link:
                         d.logger.warning("Could not find download link")
                         return None
 
-                    if hasattr(d, 'status_callback'):
-                        d.status_callback("Downloading file...")
-
-                    d.logger.info("Found download URL via FlareSolverr, downloading...")
-                    return d.download_direct(download_link, title=title, resume_attempts=resume_attempts, md5=md5)
+                    d.logger.info("Found download URL via FlareSolverr")
+                    return download_link
 
                 response.raise_for_status()
 
-                if hasattr(d, 'status_callback'):
-                    d.status_callback("Extracting download link...")
+                notify("Extracting download link...")
 
                 download_link = d.parse_download_link_from_html(response.text, md5, mirror_url)
                 if not download_link:
                     d.logger.warning("Could not find download link")
                     return None
 
-                if hasattr(d, 'status_callback'):
-                    d.status_callback("Downloading file...")
-
-                d.logger.info("Found download URL, downloading...")
-                return d.download_direct(download_link, title=title, resume_attempts=resume_attempts, md5=md5)
+                d.logger.info("Found download URL")
+                return download_link
 
             except Exception as e:
                 d.logger.error(f"Error accessing slow_download page: {e}")
@@ -76,6 +105,8 @@ def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_att
             d.logger.debug(f"Accessing external mirror: {mirror_url}")
 
             # Try to load cached cookies for this mirror
+            if not proceed():
+                return None
             d.load_cached_cookies(domain=mirror_url)
 
             try:
@@ -87,7 +118,11 @@ def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_att
                         d.logger.warning("Got 403 - trying to refresh cookies")
 
                         # Try to pre-warm new cookies
+                        if not proceed():
+                            return None
                         if d.prewarm_cookies():
+                            if not proceed():
+                                return None
                             d.logger.info("Retrying with fresh cookies...")
                             # Retry once with fresh cookies
                             response = d.session.get(mirror_url, timeout=30)
@@ -98,32 +133,25 @@ def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_att
                                 # Success with fresh cookies, continue to parse
                                 response.raise_for_status()
 
-                                if hasattr(d, 'status_callback'):
-                                    d.status_callback("Extracting download link...")
+                                notify("Extracting download link...")
 
                                 download_link = d.parse_download_link_from_html(response.text, md5, mirror_url)
                                 if not download_link:
                                     d.logger.warning("Could not find download link")
                                     return None
 
-                                if hasattr(d, 'status_callback'):
-                                    d.status_callback("Downloading file...")
-
-                                return d.download_direct(download_link, title=title, resume_attempts=resume_attempts, md5=md5)
+                                return download_link
 
                         # If cookie refresh failed or still got 403, use FlareSolverr
-                        if hasattr(d, 'status_callback'):
-                            d.status_callback("Solving CAPTCHA with FlareSolverr...")
+                        if not proceed("Solving CAPTCHA with FlareSolverr..."):
+                            return None
                         success, cookies, html_content = d.solve_with_flaresolverr(mirror_url)
                         if success:
-                            if hasattr(d, 'status_callback'):
-                                d.status_callback("Extracting download link...")
+                            notify("Extracting download link...")
                             download_link = d.parse_download_link_from_html(html_content, md5, mirror_url)
                             if download_link:
-                                if hasattr(d, 'status_callback'):
-                                    d.status_callback("Downloading file...")
-                                d.logger.info("Found download URL via FlareSolverr, downloading...")
-                                return d.download_direct(download_link, title=title, resume_attempts=resume_attempts, md5=md5)
+                                d.logger.info("Found download URL via FlareSolverr")
+                                return download_link
                         return None
                     else:
                         d.logger.warning("Got 403 but FlareSolverr not configured")
@@ -131,23 +159,19 @@ def download_from_mirror(d, mirror_url, mirror_type, md5, title=None, resume_att
 
                 response.raise_for_status()
 
-                if hasattr(d, 'status_callback'):
-                    d.status_callback("Extracting download link...")
+                notify("Extracting download link...")
 
                 download_link = d.parse_download_link_from_html(response.text, md5, mirror_url)
                 if not download_link:
                     d.logger.warning("Could not find download link")
                     return None
 
-                if hasattr(d, 'status_callback'):
-                    d.status_callback("Downloading file...")
-
-                return d.download_direct(download_link, title=title, resume_attempts=resume_attempts, md5=md5)
+                return download_link
             
             except Exception as e:
                 d.logger.error(f"Error accessing external mirror: {e}")
                 return None
     
     except Exception as e:
-        d.logger.error(f"Error downloading from mirror: {e}")
+        d.logger.error(f"Error resolving mirror: {e}")
         return None
\ No newline at end of file
@@ -1,5 +1,22 @@
 import random
-from pathlib import Path # 记得导入
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Book formats we accept from metadata (lowercase, without the dot)
+_VALID_BOOK_EXTS = frozenset({'epub', 'mobi', 'azw3'})
+
+# Number of mirrors whose pages are resolved concurrently
+_MIRROR_HEDGE = 2
+
+# Per-thread RNG so concurrent downloads don't contend on the shared random module
+_tl = threading.local()
+
+
+def _thread_rng():
+    rng = getattr(_tl, 'rng', None)
+    if rng is None:
+        rng = _tl.rng = random.Random()
+    return rng
 
 
 def orchestrate_download(d, input_string, prefer_mirror=None, resume_attempts=3, filename=None, links=None):
@@ -15,12 +32,15 @@ def orchestrate_download(d, input_string, prefer_mirror=None, resume_attempts=3,
 
     Returns: (success, used_fast_download, filepath)
     """
+    logger = d.logger
+    status_cb = getattr(d, 'status_callback', None)
+
     md5 = d.extract_md5(input_string)
     if not md5:
-        d.logger.error(f"Could not extract MD5 from: {input_string}")
+        logger.error(f"Could not extract MD5 from: {input_string}")
         return False, False, None
 
-    d.logger.info(f"Downloading: {md5}")
+    logger.info(f"Downloading: {md5}")
 
     # Fetch download info if not provided
     if filename is None or links is None:
@@ -29,80 +49,119 @@ def orchestrate_download(d, input_string, prefer_mirror=None, resume_attempts=3,
     # ---------------- [修改开始] ----------------
     # 严格检查元数据文件名
     if filename and filename != "Unknown":
-        # 定义白名单
-        valid_extensions = {'.epub', '.mobi', '.azw3'}
-        file_ext = Path(filename).suffix.lower()
+        stem, _, ext = filename.rpartition('.')
 
         # 如果文件后缀存在，但不在白名单里 (比如是 .pdf)
-        if file_ext and file_ext not in valid_extensions:
-            d.logger.error(f"ABORTING: MD5 {md5} metadata says it is '{file_ext}', but we only want epub/mobi/azw3.")
+        if stem and ext and ext.lower() not in _VALID_BOOK_EXTS:
+            logger.error(f"ABORTING: MD5 {md5} metadata says it is '.{ext.lower()}', but we only want epub/mobi/azw3.")
             return False, False, None
     # ---------------- [修改结束] ----------------
     # Try fast download first
     if d.fast_download_enabled and d.fast_download_key:
-        if hasattr(d, 'status_callback'):
-            d.status_callback("Trying fast download...")
+        if status_cb is not None:
+            status_cb("Trying fast download...")
 
         success, result = d.try_fast_download(md5)
 
         if success:
-            d.logger.info("Using fast download")
-            if hasattr(d, 'status_callback'):
-                d.status_callback("Downloading via fast download...")
+            logger.info("Using fast download")
+            if status_cb is not None:
+                status_cb("Downloading via fast download...")
 
             filepath = d.download_direct(result, title=filename, resume_attempts=resume_attempts, md5=md5)
             if filepath:
-                d.logger.info("Fast download successful")
+                logger.info("Fast download successful")
                 return True, True, filepath
             else:
-                d.logger.warning("Fast download failed, falling back to mirrors")
+                logger.warning("Fast download failed, falling back to mirrors")
         else:
-            d.logger.info(f"Fast download not available: {result}")
+            logger.info(f"Fast download not available: {result}")
 
 
     if not links:
-        d.logger.error("No download links found")
+        logger.error("No download links found")
         return False, False, None
 
-    d.logger.info(f"Found {len(links)} mirror(s)")
+    logger.info(f"Found {len(links)} mirror(s)")
 
 
     # Preferred mirror
     if prefer_mirror:
-        preferred = [link for link in links if prefer_mirror.lower() in link['domain'].lower()]
-        others = [link for link in links if prefer_mirror.lower() not in link['domain'].lower()]
+        pm = prefer_mirror.lower()
+        preferred, others = [], []
+        for link in links:
+            (preferred if pm in link['domain'].lower() else others).append(link)
         links = preferred + others
     else:
         # Shuffle to spread load across mirrors (unless user has preference)
-        random.shuffle(links)
+        _thread_rng().shuffle(links)
 
-    # Try each mirror
-    for i, mirror_link in enumerate(links):
-        mirror_name = mirror_link.get('text', mirror_link.get('domain', 'Unknown'))
-        d.logger.info(f"Trying mirror {i+1}/{len(links)}: {mirror_name}")
-
-        if hasattr(d, 'status_callback'):
-            d.status_callback(f"Accessing mirror {i+1}/{len(links)}: {mirror_name}")
-
-        filepath = d.download_from_mirror(
-            mirror_link['url'],
-            mirror_link['type'],
-            md5,
-            title=filename,
-            resume_attempts=resume_attempts
-        )
-
-        if filepath:
-            d.logger.info("Download successful")
-            if hasattr(d, 'status_callback'):
-                d.status_callback("Verifying download...")
-            return True, False, filepath
-        else:
-            d.logger.warning(f"Mirror {mirror_name} failed")
-            if i < len(links) - 1:
-                d.logger.info("Trying next mirror...")
-                if hasattr(d, 'status_callback'):
-                    d.status_callback("Mirror failed, trying next mirror...")
+    status_lock = threading.Lock()
+
+    def report(message):
+        if status_cb is not None:
+            with status_lock:
+                status_cb(message)
 
-    d.logger.error("All mirrors failed")
+    def resolve(i, mirror_link, cancel):
+        # Resolver updates are dropped once a download has started or the call has returned
+        def resolver_report(message):
+            with status_lock:
+                if status_cb is not None and not cancel.is_set():
+                    status_cb(message)
+
+        mirror_name = mirror_link.get('text', mirror_link.get('domain', 'Unknown'))
+        logger.info(f"Trying mirror {i+1}/{len(links)}: {mirror_name}")
+        resolver_report(f"Accessing mirror {i+1}/{len(links)}: {mirror_name}")
+        download_link = d.resolve_mirror_link(mirror_link['url'], mirror_link['type'], md5, status=resolver_report, cancel=cancel)
+        # A resolver stopped before a network step gets another turn if the other mirror's download fails;
+        # one that already fetched its page still returns the link, kept below as a fallback
+        return download_link, download_link is None and cancel.is_set()
+
+    # Resolve mirror pages in small hedged batches and download from whichever answers first.
+    # Only the page lookups overlap; the file itself is always downloaded by one thread.
+    pending = list(enumerate(links))
+    cancel = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=_MIRROR_HEDGE)
+    try:
+        while pending:
+            batch, pending = pending[:_MIRROR_HEDGE], pending[_MIRROR_HEDGE:]
+            cancel = threading.Event()
+            futures = {pool.submit(resolve, i, link, cancel): (i, link) for i, link in batch}
+            stopped = []
+
+            for future in as_completed(futures):
+                i, mirror_link = futures[future]
+                mirror_name = mirror_link.get('text', mirror_link.get('domain', 'Unknown'))
+                download_link, was_stopped = future.result()
+
+                if was_stopped:
+                    stopped.append((i, mirror_link))
+                    continue
+
+                if download_link:
+                    # Stop the other resolvers of this batch before they touch the status or network again
+                    with status_lock:
+                        cancel.set()
+                    report("Downloading file...")
+                    filepath = d.download_direct(download_link, title=filename, resume_attempts=resume_attempts, md5=md5)
+
+                    if filepath:
+                        logger.info("Download successful")
+                        report("Verifying download...")
+                        return True, False, filepath
+
+                logger.warning(f"Mirror {mirror_name} failed")
+
+            pending = stopped + pending
+            if pending:
+                logger.info("Trying next mirror...")
+                report("Mirror failed, trying next mirror...")
+    finally:
+        # Don't wait for a slower mirror that is still resolving, but make sure it stays quiet
+        with status_lock:
+            cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    logger.error("All mirrors failed")
     return False, False, None
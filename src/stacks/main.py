@@ -2,12 +2,10 @@
 import os
 import sys
 import signal
-import argparse
 from stacks.server.webserver import create_app
 
-from pathlib import Path
 
-from stacks.constants import CONFIG_FILE, PROJECT_ROOT, LOG_PATH, DOWNLOAD_PATH
+from stacks.constants import CONFIG_FILE, PROJECT_ROOT, LOG_PATH, DOWNLOAD_PATH, VERSION
 
 # ANSI color codes (Dracula theme)
 INFO = "\033[38;2;139;233;253m"       # cyan
@@ -19,33 +17,40 @@ BG = "\033[48;2;40;42;54m"            # black background
 PINKBG = "\033[48;2;255;102;217m"     # pink background
 RESET = "\033[0m"                     # reset
 
+# Logo template, filled in and written with a single write call
+_LOGO_TEMPLATE = (
+    f"{BG}{PURPLE} ┌───────────────────────────────────────────────────────────┐ {RESET}\n"
+    f"{BG}{PURPLE} │                                                           {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}     ▄████▄ ████████  ▄█▄     ▄████▄  ██    ▄██ ▄████▄     {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}    ██▀  ▀██   ██    ▄{PINKBG}{PURPLE}▄{BG}▀{PINKBG}▄{BG}{PINK}▄   ██▀  ▀██ ██  ▄██▀ ██▀  ▀██    {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}    ██▄        ██    █{PURPLE}█ █{PINK}█  ██        ██▄██▀   ██▄         {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}     ▀████▄    ██   █{PURPLE}█   █{PINK}█ ██        ████      ▀████▄     {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}         ▀██   ██   █{PURPLE}█   █{PINK}█ ██        ██▀██▄        ▀██    {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}    ██▄  ▄██   ██  █{PURPLE}█     █{PINK}█ ██▄  ▄██ ██  ▀██▄ ██▄  ▄██    {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │{PINK}     ▀████▀    ██  █{PURPLE}▀     ▀{PINK}█  ▀████▀  ██    ▀██ ▀████▀     {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} │                                                           {PURPLE}│ {RESET}\n"
+    f"{BG}{PURPLE} └{{dashes}}╢v{{version}}╟────┘ {RESET}\n"
+)
+
 def print_logo(version: str):
     """Display the super cool STACKS logo"""
     dashes = '─' * (52 - len(version))
-
-    print(f"{BG}{PURPLE} ┌───────────────────────────────────────────────────────────┐ {RESET}")
-    print(f"{BG}{PURPLE} │                                                           {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}     ▄████▄ ████████  ▄█▄     ▄████▄  ██    ▄██ ▄████▄     {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}    ██▀  ▀██   ██    ▄{PINKBG}{PURPLE}▄{BG}▀{PINKBG}▄{BG}{PINK}▄   ██▀  ▀██ ██  ▄██▀ ██▀  ▀██    {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}    ██▄        ██    █{PURPLE}█ █{PINK}█  ██        ██▄██▀   ██▄         {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}     ▀████▄    ██   █{PURPLE}█   █{PINK}█ ██        ████      ▀████▄     {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}         ▀██   ██   █{PURPLE}█   █{PINK}█ ██        ██▀██▄        ▀██    {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}    ██▄  ▄██   ██  █{PURPLE}█     █{PINK}█ ██▄  ▄██ ██  ▀██▄ ██▄  ▄██    {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │{PINK}     ▀████▀    ██  █{PURPLE}▀     ▀{PINK}█  ▀████▀  ██    ▀██ ▀████▀     {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} │                                                           {PURPLE}│ {RESET}")
-    print(f"{BG}{PURPLE} └{dashes}╢v{version}╟────┘ {RESET}")
-    sys.stdout.flush()  # Force flush before exec
-    sys.stdout.flush()
+    sys.stdout.write(_LOGO_TEMPLATE.format(dashes=dashes, version=version))
+    sys.stdout.flush()  # Force flush before the server starts logging
 
 def ensure_directories():
     """Ensure essential directories exist."""
     dirs = [
-        Path(CONFIG_FILE).parent,
-        Path(LOG_PATH),
-        Path(DOWNLOAD_PATH),
+        os.path.dirname(CONFIG_FILE),
+        LOG_PATH,
+        DOWNLOAD_PATH,
     ]
     for directory in dirs:
-        directory.mkdir(parents=True, exist_ok=True)
+        # Warm start: a single stat per directory, only create what is missing
+        try:
+            os.stat(directory)
+        except FileNotFoundError:
+            os.makedirs(directory, exist_ok=True)
 
 
 def setup_config(config_path):
@@ -53,19 +58,21 @@ def setup_config(config_path):
     Ensure a config file exists.
     """
     # Use either provided config, or default
-    cfg_path = Path(config_path) if config_path else Path(CONFIG_FILE)
+    cfg_path = config_path or str(CONFIG_FILE)
 
     print("◼ Checking configuration...")
     sys.stdout.flush()
 
-    if not cfg_path.exists():
+    if not os.path.exists(cfg_path):
         print("  No config.yaml found — creating new one.")
-        cfg_path.write_text("{}\n")
-        cfg_path.chmod(0o600)
+        # Create with owner-only permissions in one step (no window with default mode)
+        fd = os.open(cfg_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write("{}\n")
     else:
         print(f"  Using config at {cfg_path}")
 
-    return str(cfg_path)
+    return cfg_path
 
 
 def setup_signal_handlers(app):
@@ -87,6 +94,12 @@ def setup_signal_handlers(app):
             sys.stdout.flush()
             app.stacks_worker.downloader.cleanup()
 
+        # Write any pending config changes
+        if hasattr(app, 'stacks_config') and app.stacks_config:
+            print(f"{INFO}  Saving config...{RESET}")
+            sys.stdout.flush()
+            app.stacks_config.flush()
+
         # Save queue state
         if hasattr(app, 'stacks_queue') and app.stacks_queue:
             print(f"{INFO}  Saving queue state...{RESET}")
@@ -101,27 +114,37 @@ def setup_signal_handlers(app):
     signal.signal(signal.SIGINT, shutdown_handler)
 
 
-def main():
+def parse_config_arg():
+    """
+    Return the --config path from the command line, or None.
+    """
+    # The usual launch has no arguments at all, so don't build a parser for it
+    if len(sys.argv) == 1:
+        return None
+
+    import argparse
     parser = argparse.ArgumentParser(description="Start the Stacks server.")
     parser.add_argument(
         "-c", "--config",
         help="Path to an alternative config.yaml file"
     )
-    args = parser.parse_args()
+    return parser.parse_args().config
+
+
+def main():
+    config_arg = parse_config_arg()
 
     # Set UTF-8 encoding
     os.environ.setdefault("LANG", "C.UTF-8")
 
-    # Read version
-    version_file = PROJECT_ROOT / "VERSION"
-    version = version_file.read_text().strip() if version_file.exists() else "unknown"
-    print_logo(version)
+    # Version was already read once when constants loaded
+    print_logo(VERSION)
 
     # Ensure directories exist
     ensure_directories()
 
     # Load or create config.yaml
-    config_path = setup_config(args.config)
+    config_path = setup_config(config_arg)
 
     # Detect password reset request
     if os.environ.get("RESET_ADMIN", "false").lower() == "true":
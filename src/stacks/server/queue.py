@@ -46,29 +46,43 @@ class DownloadQueue:
     def add(self, md5, source=None):
         """Add item to queue"""
         with self.lock:
-            # Check if in queue
-            if any(item['md5'] == md5 for item in self.queue):
-                return False, "Already in queue"
+            success, message = self._add_item(md5, source)
+            if success:
+                self.save()
+            return success, message
 
-            # Check if currently downloading
-            if self.current_download and self.current_download['md5'] == md5:
-                return False, "Currently downloading"
+    def add_many(self, md5s, source=None):
+        """Add several items to queue, saving once at the end"""
+        with self.lock:
+            results = [(md5, *self._add_item(md5, source)) for md5 in md5s]
+            if any(success for _, success, _ in results):
+                self.save()
+            return results
 
-            # Check if recently SUCCESSFULLY downloaded (allow retry of failures)
-            if any(item['md5'] == md5 and item.get('success', False) for item in self.history[-50:]):
-                return False, "Recently downloaded"
+    def _add_item(self, md5, source):
+        """Append an item unless it is queued, downloading or recently done. Caller holds the lock."""
+        # Check if in queue
+        if any(item['md5'] == md5 for item in self.queue):
+            return False, "Already in queue"
 
-            item = {
-                'md5': md5,
-                'source': source,
-                'added_at': datetime.now().isoformat(),
-                'status': 'queued'
-            }
+        # Check if currently downloading
+        if self.current_download and self.current_download['md5'] == md5:
+            return False, "Currently downloading"
 
-            self.queue.append(item)
-            self.save()
-            self.logger.info(f"Added to queue: {md5}")
-            return True, "Added to queue"
+        # Check if recently SUCCESSFULLY downloaded (allow retry of failures)
+        if any(item['md5'] == md5 and item.get('success', False) for item in self.history[-50:]):
+            return False, "Recently downloaded"
+
+        item = {
+            'md5': md5,
+            'source': source,
+            'added_at': datetime.now().isoformat(),
+            'status': 'queued'
+        }
+
+        self.queue.append(item)
+        self.logger.info(f"Added to queue: {md5}")
+        return True, "Added to queue"
     
     def get_next(self):
         """Get next item from queue"""
@@ -4,6 +4,7 @@ import time
 from datetime import datetime
 from stacks.downloader.downloader import AnnaDownloader
 from stacks.constants import FAST_DOWNLOAD_API_URL, DOWNLOAD_PATH, INCOMPLETE_PATH
+from stacks.utils.httputils import HTTP_SESSION
 
 class DownloadWorker:
     def __init__(self, queue, config):
@@ -13,6 +14,9 @@ class DownloadWorker:
         self.thread = None
         self.logger = logging.getLogger('worker')
 
+        # Held while a background fast download info refresh is running
+        self._refresh_lock = threading.Lock()
+
         # Progress callback to update current download
         def progress_callback(progress):
             if self.queue.current_download:
@@ -53,6 +57,9 @@ class DownloadWorker:
         # Convert timeout to milliseconds (downloader expects milliseconds)
         flaresolverr_timeout_ms = flaresolverr_timeout * 1000
 
+        # Hand the previous session over so its open connections (and cookies) are reused
+        previous = getattr(self, 'downloader', None)
+
         # Pass None if FlareSolverr is disabled, otherwise pass the URL
         self.downloader = AnnaDownloader(
             output_dir=DOWNLOAD_PATH,
@@ -61,44 +68,56 @@ class DownloadWorker:
             status_callback=self.status_callback,
             fast_download_config=fast_config,
             flaresolverr_url=flaresolverr_url if flaresolverr_enabled else None,
-            flaresolverr_timeout=flaresolverr_timeout_ms
+            flaresolverr_timeout=flaresolverr_timeout_ms,
+            session=previous.session if previous else None
         )
 
-        # Test fast download key if enabled and key is present
+        # Test the fast download key and FlareSolverr at the same time, they are independent round trips
+        key_test = None
         if fast_config['enabled'] and fast_config['key']:
-            self.logger.info("Testing fast download key...")
-            try:
-                success = self.downloader.refresh_fast_download_info(force=True)
-
-                if success:
-                    info = self.downloader.get_fast_download_info()
-                    self.logger.info(f"Fast download key valid - {info.get('downloads_left')}/{info.get('downloads_per_day')} downloads available")
-                else:
-                    self.logger.warning("Fast download key test failed")
-            except Exception as e:
-                self.logger.error(f"Failed to test fast download key: {e}")
+            key_test = threading.Thread(target=self._test_fast_download_key, daemon=True)
+            key_test.start()
 
-        # Test FlareSolverr if enabled
         if flaresolverr_enabled and flaresolverr_url:
-            # Normalize URL for testing (same as downloader does)
-            test_url = flaresolverr_url
-            if not test_url.startswith(('http://', 'https://')):
-                test_url = f"http://{test_url}"
+            self._test_flaresolverr(flaresolverr_url)
 
-            self.logger.info(f"Testing FlareSolverr connection at {test_url}...")
-            try:
-                import requests
-                response = requests.get(test_url, timeout=5)
-                if response.status_code == 200:
-                    self.logger.info("FlareSolverr connection successful")
-                else:
-                    self.logger.warning(f"FlareSolverr returned status {response.status_code}")
-            except Exception as e:
-                self.logger.error(f"Failed to connect to FlareSolverr: {e}")
-                self.logger.warning("Downloads will fall back to external mirrors only")
+        if key_test:
+            key_test.join()
 
         self.logger.info("Downloader recreated with updated config")
 
+    def _test_fast_download_key(self):
+        """Test fast download key and log the remaining downloads"""
+        self.logger.info("Testing fast download key...")
+        try:
+            success = self.downloader.refresh_fast_download_info(force=True)
+
+            if success:
+                info = self.downloader.get_fast_download_info()
+                self.logger.info(f"Fast download key valid - {info.get('downloads_left')}/{info.get('downloads_per_day')} downloads available")
+            else:
+                self.logger.warning("Fast download key test failed")
+        except Exception as e:
+            self.logger.error(f"Failed to test fast download key: {e}")
+
+    def _test_flaresolverr(self, flaresolverr_url):
+        """Test FlareSolverr connection"""
+        # Normalize URL for testing (same as downloader does)
+        test_url = flaresolverr_url
+        if not test_url.startswith(('http://', 'https://')):
+            test_url = f"http://{test_url}"
+
+        self.logger.info(f"Testing FlareSolverr connection at {test_url}...")
+        try:
+            response = HTTP_SESSION.get(test_url, timeout=5)
+            if response.status_code == 200:
+                self.logger.info("FlareSolverr connection successful")
+            else:
+                self.logger.warning(f"FlareSolverr returned status {response.status_code}")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to FlareSolverr: {e}")
+            self.logger.warning("Downloads will fall back to external mirrors only")
+
     def update_config(self):
         """Update downloader with new config (called when config changes)"""
         self.recreate_downloader()
@@ -144,8 +163,24 @@ class DownloadWorker:
         return self.downloader.get_fast_download_info()
 
     def refresh_fast_download_info_if_stale(self):
-        """Refresh fast download info if it's been more than an hour"""
-        return self.downloader.refresh_fast_download_info(force=False)
+        """Refresh fast download info in the background if it's been more than an hour"""
+        downloader = self.downloader
+        if not downloader.is_fast_download_info_stale():
+            return
+
+        # Callers get the cached info right away, only one refresh runs at a time
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def refresh():
+            try:
+                downloader.refresh_fast_download_info(force=False)
+            except Exception as e:
+                self.logger.error(f"Failed to refresh fast download info: {e}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=refresh, daemon=True).start()
 
     def _worker_loop(self):
         """Main worker loop"""
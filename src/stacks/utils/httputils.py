@@ -0,0 +1,19 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_connections=10, pool_maxsize=50, max_retries=0):
+    """Create a requests session with a keep-alive connection pool mounted for http and https."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared session for the server's own short test/health requests
+HTTP_SESSION = create_session()
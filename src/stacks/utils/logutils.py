@@ -1,17 +1,31 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 import flask
-from stacks.constants import LOG_PATH, LOG_FORMAT, LOG_DATE_FORMAT, LOG_VIEW_LENGTH
+from stacks.constants import LOG_PATH, LOG_FILENAME, LOG_BACKUP_DAYS, LOG_FORMAT, LOG_DATE_FORMAT, LOG_VIEW_LENGTH
 from pathlib import Path
-from datetime import datetime
 from collections import deque
 
 LOG_BUFFER = deque(maxlen=LOG_VIEW_LENGTH)
 
+# Console and file output are written by a background listener fed through this queue
+_log_queue = queue.SimpleQueue()
+_listener = None
+
+# Stays on the root logger across setup_logging calls, so nothing logged during a reconfigure is lost
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+
+# Open file handler, kept across setup_logging calls while the log path is unchanged
+_file_handler = None
+
 def setup_logging(config=None):
     """
     Setup logging.
     """
+    global _file_handler, _listener
 
     # ---- Determine log level ----
     if config is None:
@@ -28,10 +42,8 @@ def setup_logging(config=None):
     log_path.mkdir(parents=True, exist_ok=True)
 
 
-    # ---- Generate Logfile name ----
-    log_file = (
-        log_path / f"log-{datetime.now().strftime('%Y-%m-%d')}.log"
-    )
+    # ---- Logfile name (rotated at midnight by the handler) ----
+    log_file = log_path / LOG_FILENAME
 
     # ---- Root logger ----
     root_logger = logging.getLogger()
@@ -41,16 +53,26 @@ def setup_logging(config=None):
     flask.cli.show_server_banner = lambda *args, **kwargs: None
     logging.getLogger('werkzeug').disabled = True
 
-    # ---- Remove old handlers ----
-    for handler in root_logger.handlers[:]:
+    # ---- Stop old listener (drains pending records first) ----
+    old_handlers = []
+    if _listener is not None:
+        _listener.stop()
+        old_handlers = list(_listener.handlers)
+        _listener = None
+
+    # ---- Remove old handlers (records keep queueing meanwhile) ----
+    for handler in root_logger.handlers[:] + old_handlers:
+        if handler is _queue_handler:
+            continue
         root_logger.removeHandler(handler)
-        handler.close()
+        if handler is not _file_handler:
+            handler.close()
 
     # ---- Create console handler ----
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # ---- Add UI buffer handler ----
     ui_handler = UILogHandler()
@@ -60,10 +82,26 @@ def setup_logging(config=None):
 
     # ---- Create file handler only when config exists ----
     if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
-        root_logger.addHandler(file_handler)
+        # Reuse the open handler unless the log path changed
+        if _file_handler is None or _file_handler.baseFilename != os.path.abspath(log_file):
+            if _file_handler is not None:
+                _file_handler.close()
+            _file_handler = logging.handlers.TimedRotatingFileHandler(
+                log_file,
+                when='midnight',
+                backupCount=LOG_BACKUP_DAYS,
+                delay=True,
+                encoding='utf-8'
+            )
+            _file_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+        _file_handler.setLevel(log_level)
+        handlers.append(_file_handler)
+
+    # ---- Hand console/file output to the background listener ----
+    _listener = logging.handlers.QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if _queue_handler not in root_logger.handlers:
+        root_logger.addHandler(_queue_handler)
 
     # ---- Configure werkzeug logger ----
     werkzeug_logger = logging.getLogger('werkzeug')
@@ -80,7 +118,20 @@ def setup_logging(config=None):
     werkzeug_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
     werkzeug_logger.addHandler(werkzeug_handler)
 
+    # ---- Keep gunicorn loggers from double-writing through root ----
+    for name in ('gunicorn.error', 'gunicorn.access'):
+        logging.getLogger(name).propagate = False
+
+
+
+
+def _stop_listener():
+    """Flush queued log records on interpreter exit."""
+    if _listener is not None:
+        _listener.stop()
+
 
+atexit.register(_stop_listener)
 
 
 class UILogHandler(logging.Handler):
@@ -1,11 +1,11 @@
-import re
+from stacks.constants import RE_MD5, RE_MD5_URL
 
 def extract_md5(input_string):
     """Extract MD5 hash from URL or return the MD5 if it's already one."""
-    if re.match(r'^[a-f0-9]{32}$', input_string.lower()):
+    if RE_MD5.match(input_string.lower()):
         return input_string.lower()
     
-    match = re.search(r'/md5/([a-f0-9]{32})', input_string)
+    match = RE_MD5_URL.search(input_string)
     if match:
         return match.group(1)
     